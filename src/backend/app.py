@@ -1,8 +1,16 @@
 import os
+import gc
+import asyncio
+import logging
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import List, Optional
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
-import pandas as pd
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 import uuid
 
 # Import the core modules from the same directory
@@ -10,10 +18,10 @@ from . import database as db
 from . import storage
 from . import processing
 from . import llm_chain
-from .worker import BackgroundProcessor, get_processor_instance # Import the worker logic
 
 # --- 1. Initialization ---
-app = FastAPI(title="Knowledge Atlas API")
+# orjson serializes the dashboard payloads considerably faster than the stdlib encoder
+app = FastAPI(title="Knowledge Atlas API", default_response_class=ORJSONResponse)
 app.docs_url = None
 app.redoc_url = None
 
@@ -22,63 +30,123 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],  # Vite default port
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists (rather than "*") let browsers cache the preflight response for max_age
+    allow_methods=["GET", "POST"],
+    allow_headers=["content-type", "authorization"],
+    max_age=7200,
+)
+
+# Dashboard JSON (summaries, ELI5 text) compresses well; level 4 keeps CPU cost low
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
+# Separate pool for scraping, LLM calls, S3 transfers and image resizing, so slow network
+# calls can't starve the dashboard's SQLite work on the default executor
+processing_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PROCESSING_THREADPOOL_SIZE", 8)),
+    thread_name_prefix="processing",
 )
 
-# Initialize the database and start the processor thread
+def run_in_processing(func, *args):
+    """Runs a blocking processing/network call on processing_executor."""
+    return asyncio.get_running_loop().run_in_executor(processing_executor, partial(func, *args))
+
+# Initialize the database and start the job dispatcher
 @app.on_event("startup")
-def startup_event():
+async def startup_event():
+    global _write_queue, _status_writer_task, _jobs_available, _job_dispatcher_task, _job_lease_task
+
+    # Bounded pool for the blocking SQLite calls offloaded from the event loop,
+    # so bursts of dashboard polls queue up instead of spawning ever more threads
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=int(os.getenv("DB_THREADPOOL_SIZE", 8)))
+    )
+
     db.init_db()
-    
-    # Get and start the single background processor instance
-    processor = get_processor_instance()
-    if not processor.is_alive():
-        processor.start()
-    print("Database and Background Processor started.")
+    # Compact the FTS index and database file without delaying startup
+    threading.Thread(target=db.optimize_db, daemon=True).start()
 
-# --- 2. API Endpoints ---
+    # Single writer coroutine that batches the workers' status updates
+    _write_queue = asyncio.Queue()
+    _status_writer_task = asyncio.create_task(status_writer())
+
+    # Recover jobs whose worker died; jobs leased by live workers (other processes) are left alone
+    await asyncio.to_thread(db.requeue_expired_jobs)
+    _jobs_available = asyncio.Event()
+    _job_dispatcher_task = asyncio.create_task(job_dispatcher())
+    _job_lease_task = asyncio.create_task(job_lease_keeper())
+    print("Database and job dispatcher started.")
 
-# Dependency to get the processor instance for queuing tasks
-def get_processor() -> BackgroundProcessor:
-    return get_processor_instance()
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Stop claiming jobs, then commit any queued status updates before the loop goes away.
+    # Jobs interrupted mid-run stay 'running' and are requeued once their lease lapses.
+    if _job_dispatcher_task is not None:
+        _job_dispatcher_task.cancel()
+    if _job_lease_task is not None:
+        _job_lease_task.cancel()
+    await flush_statuses()
+    if _status_writer_task is not None:
+        _status_writer_task.cancel()
+    processing_executor.shutdown(wait=False, cancel_futures=True)
+
+# --- 2. API Endpoints ---
 
 ## A. Dashboard Data Endpoint (READ & SEARCH)
 # Matches the requirements for pagination and keyword search
 @app.get("/api/entries")
-def get_entries(
-    page: int = 1, 
-    limit: int = 10, 
-    keyword: Optional[str] = None
+async def get_entries(
+    page: int = Query(1, ge=1), 
+    limit: int = Query(10, ge=1, le=100), 
+    keyword: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    tag: Optional[str] = None,
+    infix: bool = False
 ):
-    """Fetches paginated and optionally filtered entries for the dashboard."""
-    
-    # 1. Fetch matching IDs using FTS5 if a keyword is provided
-    if keyword:
-        # Assumes database.py has a search_entries function using FTS5
-        matching_ids = db.search_entries(keyword)
-    else:
-        matching_ids = None
-    
-    # 2. Fetch data, apply filtering, pagination, and total count
-    # Assumes database.py has a get_paginated_entries function
-    data_df, total_count = db.get_paginated_entries(
-        page=page, 
-        limit=limit, 
-        matching_ids=matching_ids
-    )
+    """
+    Fetches paginated and optionally filtered entries for the dashboard.
+    Pass the `next_cursor` of the previous response as `cursor` to seek to the next page;
+    `page` is only used for direct jumps when no cursor is known.
+    The total count is only computed when `include_total` is set (infinite-scroll clients can skip it).
+    Set `infix` to match the keyword anywhere inside words rather than as a word prefix.
+    """
 
-    # Convert DataFrame to list of dictionaries for JSON response
-    return {
-        "data": data_df.to_dict(orient="records"),
-        "total": total_count
-    }
+    # Fetch data, apply FTS5 keyword filtering, pagination, and total count in one query
+    try:
+        data, total_count, next_cursor = await asyncio.to_thread(
+            db.get_paginated_entries,
+            page=page, 
+            limit=limit, 
+            tag=tag,
+            cursor=cursor,
+            keyword=keyword,
+            include_total=include_total,
+            infix=infix
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Returned directly so FastAPI skips its jsonable_encoder pass over every row
+    return ORJSONResponse({
+        "data": data,
+        "total": total_count,
+        "next_cursor": next_cursor
+    })
+
+## A2. Entry Detail Endpoint (READ)
+# The dashboard list only carries the narrow columns; long-form fields are loaded on drill-down
+@app.get("/api/entries/{entry_id}")
+async def get_entry_detail(entry_id: str):
+    """Fetches the full record of a single entry, including summary, ELI5 and tags."""
+    entry = await asyncio.to_thread(db.get_entry, entry_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Entry not found.")
+    return entry
 
 ## B. Upload Endpoint (CREATE)
 # Handles the per-item submission from the UploadForm.tsx
 @app.post("/api/upload")
 async def upload_entry(
-    processor: BackgroundProcessor = Depends(get_processor),
     # Common metadata fields passed as Form data
     theme: str = Form(...),
     entryDate: str = Form(...),
@@ -102,12 +170,10 @@ async def upload_entry(
         file_extension = file.filename.split('.')[-1] if file.filename else 'dat'
         temp_path = f"temp/{uuid.uuid4()}.{file_extension}"
         
-        # Read file contents into BytesIO to pass to storage module
-        file_content = await file.read()
-        file_stream = pd.io.common.BytesIO(file_content)
-
-        # Assumes storage.upload_file can handle file streams
-        source_url = storage.upload_file(file_stream, temp_path) 
+        # Stream the spooled upload straight to storage instead of buffering it in memory
+        source_url = await run_in_processing(
+            storage.upload_file, file.file, temp_path, file.content_type
+        )
         if not source_url:
             raise HTTPException(status_code=500, detail="Failed to upload file to storage.")
     
@@ -122,47 +188,237 @@ async def upload_entry(
         "entry_date": entryDate
     }
     
-    new_id = db.add_entry(entry_data)
+    new_id = await asyncio.to_thread(db.add_entry, entry_data)
     
     # Add the task to the queue for background processing
-    processor.add_task(new_id)
+    await queue_jobs([new_id])
 
     return {"message": "Entry submitted and queued for processing.", "id": new_id}
 
 ## C. Reprocess Endpoint
 @app.post("/api/reprocess/{entry_id}")
-def reprocess_entry(entry_id: str, processor: BackgroundProcessor = Depends(get_processor)):
+async def reprocess_entry(entry_id: str):
     """Sets entry status back to 'Uploaded' and re-queues the task."""
     
-    entry = db.get_entry(entry_id)
+    entry = await asyncio.to_thread(db.get_entry, entry_id)
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found.")
-        
-    db.update_status(entry_id, "Uploaded")
-    processor.add_task(entry_id)
+
+    # Only a job whose worker's lease has lapsed is replaced; a live one (in any process) wins
+    if not await asyncio.to_thread(db.requeue_entry, entry_id):
+        raise HTTPException(status_code=409, detail="Entry is already queued or being processed.")
+    _jobs_available.set()
     
     return {"message": f"Entry {entry_id} reset to Uploaded and re-queued."}
 
-import gc
-import asyncio
-import logging
 from typing import Dict, Any
 
 
-process_semaphore = asyncio.Semaphore(int(os.getenv("SCHEDULER_CONCURRENT_LIMIT", 4)))
-entries_active = set()
-entries_lock = asyncio.Lock()
+class AdmissionController:
+    """
+    Bounds the number of processing workers running at once.
+    Unlike asyncio.Semaphore the cap can be changed at runtime with resize().
+    The Condition is created on first use, so it always belongs to the running event loop.
+    """
+
+    def __init__(self, cap: int):
+        self._cap = cap
+        self._active = 0
+        self._cond: Optional[asyncio.Condition] = None
+
+    @property
+    def cond(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def acquire(self):
+        async with self.cond:
+            await self.cond.wait_for(lambda: self._active < self._cap)
+            self._active += 1
+
+    async def release(self):
+        async with self.cond:
+            self._active -= 1
+            self.cond.notify(1)
+
+    async def resize(self, cap: int):
+        async with self.cond:
+            self._cap = cap
+            self.cond.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.release()
+
+
+admission_controller = AdmissionController(int(os.getenv("SCHEDULER_CONCURRENT_LIMIT", 4)))
+# Processing jobs live in the persistent 'jobs' table; job_dispatcher() claims them whenever
+# the admission controller has a free slot. entries_active holds the in-flight tasks.
+# Claims are leased to WORKER_ID and renewed by job_lease_keeper(), so several processes
+# can share the queue and only a dead process's jobs are recovered.
+JOB_POLL_INTERVAL = 1.0
+WORKER_ID = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+entries_active: Dict[str, asyncio.Task] = {}
+_jobs_available: Optional[asyncio.Event] = None
+_job_dispatcher_task: Optional[asyncio.Task] = None
+_job_lease_task: Optional[asyncio.Task] = None
+
+# Worker status updates are queued and written in batches by status_writer(). Workers never
+# read their own stage back, so intermediate stages need not wait for the write; the final
+# stage is awaited so a job is only marked done once its results are committed.
+STATUS_BATCH_SIZE = 64
+STATUS_FLUSH_INTERVAL = 0.005
+_write_queue: Optional[asyncio.Queue] = None
+_status_writer_task: Optional[asyncio.Task] = None
+
+def enqueue_status(entry_id: str, stage: str, result_data: Optional[dict] = None) -> asyncio.Future:
+    """
+    Queues a db.update_status call for the batching writer.
+    Returns a future that resolves once the update is committed (or fails with its error).
+    """
+    future = asyncio.get_running_loop().create_future()
+    # Intermediate stages are not awaited; status_writer already logs a failed update, so mark
+    # the exception retrieved to avoid asyncio's "Future exception was never retrieved"
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    _write_queue.put_nowait(((entry_id, stage, result_data), future))
+    return future
+
+async def status_writer():
+    """Drains queued status updates and commits up to STATUS_BATCH_SIZE of them per transaction."""
+    while True:
+        batch = [await _write_queue.get()]
+        await asyncio.sleep(STATUS_FLUSH_INTERVAL)  # Let concurrent workers add to this batch
+        while len(batch) < STATUS_BATCH_SIZE and not _write_queue.empty():
+            batch.append(_write_queue.get_nowait())
 
-async def process_worker_wapper(worker_data: Dict[str, Any]):
-    async with process_semaphore:
         try:
-            await None #>> (**worker_data)
-        except Exception as e:
-            logging.exception(f"Processing worker error for {worker_data['entry_id']}: {e}")
+            try:
+                await asyncio.to_thread(db.update_statuses, [update for update, _ in batch])
+                for _, future in batch:
+                    future.set_result(None)
+            except Exception as e:
+                # One bad update fails the whole transaction; apply them one by one so only it is lost
+                logging.warning(f"Status batch of {len(batch)} failed ({e}), retrying individually")
+                for update, future in batch:
+                    try:
+                        await asyncio.to_thread(db.update_statuses, [update])
+                        future.set_result(None)
+                    except Exception as row_error:
+                        logging.exception(f"Status update for {update[0]} failed: {row_error}")
+                        future.set_exception(row_error)
+        finally:
+            for _ in batch:
+                _write_queue.task_done()
+
+async def flush_statuses():
+    """Waits until every queued status update has been written."""
+    if _write_queue is not None:
+        await _write_queue.join()
+
+async def process_entry(entry_id: str):
+    """Runs the preprocessing and summarization stages for one entry, recording each stage."""
+    entry = await asyncio.to_thread(db.get_entry, entry_id)
+    if not entry:
+        raise ValueError(f"Entry {entry_id} not found.")
+
+    try:
+        enqueue_status(entry_id, "Preprocessing")
+
+        if entry['source_type'] == 'link':
+            page = await run_in_processing(processing.scrape_website, entry['source_url'])
+            enqueue_status(entry_id, "Summarizing")
+            analysis = await run_in_processing(llm_chain.analyze_text_content, page['text'])
+            result_data = {
+                "summary_caption": analysis['summary'],
+                "explain_like_im_5": analysis['eli5'],
+                "tags": analysis['tags']
+            }
+        else:
+            image_stream = await run_in_processing(storage.download_file_obj, entry['source_url'])
+            resized = await run_in_processing(processing.resize_image_for_storage, image_stream)
+            storage_path = await run_in_processing(
+                storage.upload_file, resized, f"images/{entry_id}.jpg", "image/jpeg"
+            )
+            enqueue_status(entry_id, "Summarizing", {"file_storage_path": storage_path})
+            analysis = await run_in_processing(llm_chain.analyze_image_content, resized.getvalue())
+            result_data = {
+                "summary_caption": analysis['caption'],
+                "explain_like_im_5": analysis['eli5'],
+                "tags": analysis['tags']
+            }
+
+        # Wait for the commit: the job must not be marked done before its results are stored
+        await enqueue_status(entry_id, "Complete", result_data)
+    except Exception:
+        await enqueue_status(entry_id, "Error")
+        raise
+
+async def process_worker_wrapper(worker_data: Dict[str, Any]):
+    """Runs one claimed job in an admission slot that the dispatcher already acquired."""
+    state = "done"
+    try:
+        await process_entry(worker_data['entry_id'])
+    except Exception as e:
+        state = "failed"
+        logging.exception(f"Processing worker error for {worker_data['entry_id']}: {e}")
+    finally:
+        try:
+            await asyncio.to_thread(db.finish_job, worker_data['job_id'], state, WORKER_ID)
         finally:
-            async with entries_lock:
-                await asyncio.sleep(5)  # Make sure frontend has time to fetch final status
-                entries_lock.discard(worker_data['entry_id'])
+            entries_active.pop(worker_data['entry_id'], None)
+            await admission_controller.release()
+
+async def job_dispatcher():
+    """Claims queued jobs from the database while worker slots are free."""
+    while True:
+        await admission_controller.acquire()
+        # Cleared before claiming, so a job queued after an empty claim still wakes us below
+        _jobs_available.clear()
+        try:
+            job = await asyncio.to_thread(db.claim_job, WORKER_ID)
+        except Exception as e:
+            logging.exception(f"Failed to claim processing job: {e}")
+            job = None
+
+        if job is not None:
+            job_id, entry_id = job
+            entries_active[entry_id] = asyncio.create_task(
+                process_worker_wrapper({
+                    'job_id': job_id,
+                    'entry_id': entry_id
+                })
+            )
+            continue
+
+        await admission_controller.release()
+        # Sleep until new jobs are queued here (or poll, as another process may queue some)
+        try:
+            await asyncio.wait_for(_jobs_available.wait(), JOB_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+async def job_lease_keeper():
+    """Renews the leases of this process's running jobs and recovers jobs whose lease lapsed."""
+    while True:
+        await asyncio.sleep(db.JOB_LEASE_SECONDS / 3)
+        try:
+            if entries_active:
+                await asyncio.to_thread(db.renew_job_leases, WORKER_ID)
+            if await asyncio.to_thread(db.requeue_expired_jobs):
+                _jobs_available.set()
+        except Exception as e:
+            logging.exception(f"Failed to maintain job leases: {e}")
+
+async def queue_jobs(entry_ids: List[str]) -> List[str]:
+    """Persists processing jobs for the entries and wakes the dispatcher."""
+    queued = await asyncio.to_thread(db.enqueue_jobs, entry_ids)
+    if queued:
+        _jobs_available.set()
+    return queued
 
 @app.post("/schedule_processing_jobs")
 async def schedule_processing_jobs(
@@ -170,17 +426,10 @@ async def schedule_processing_jobs(
     entry_ids: List[str],
 ):  
     # verify credentials
-    new_entry_ids = [x for x in entry_ids if (x not in entries_active)]
     try:
-        for entry_id in entry_ids:
-            asyncio.create_task(
-                process_worker_wapper({
-                    'entry_id': entry_id
-                })
-            )
-            # Update metadata to queued
-
-    except Exception as e:
-        pass
+        # Entries with a job already queued or running are skipped by the jobs table
+        new_entry_ids = await queue_jobs(entry_ids)
     finally:
-        gc.collect()
\ No newline at end of file
+        gc.collect()
+
+    return {"scheduled": new_entry_ids}
\ No newline at end of file
@@ -1,31 +1,176 @@
+import os
+import re
+import base64
+import binascii
+import queue
 import sqlite3
-import json
-from datetime import datetime
+import threading
+import orjson
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 import uuid
-from typing import List, Optional, Tuple
-import pandas as pd
+from typing import Dict, Iterator, List, Optional, Tuple
 
 DB_FILE = "repository.db"
+DB_READER_POOL_SIZE = int(os.getenv("DB_READER_POOL_SIZE", 4))
 
-def get_db_connection():
-    """Returns a connection object to the SQLite database."""
-    return sqlite3.connect(DB_FILE)
+# Porter stemming over unicode61 tokens, so 'paint' also matches 'painting' and 'painted',
+# with diacritics folded ('cafe' matches 'café')
+FTS_TOKENIZE = "porter unicode61 remove_diacritics 2"
+
+# FTS index tables over entries.summary_caption and their tokenizers. The trigram index
+# answers infix queries ('graph' in 'photography') that token-based indexes cannot.
+FTS_TABLES = {
+    "entries_fts": FTS_TOKENIZE,
+    "entries_fts_tri": "trigram",
+}
+
+# Shorter keywords match too much of the index to be worth running (and trigram needs 3 chars)
+FTS_MIN_KEYWORD_LENGTH = 3
+
+# Per-connection tuning. journal_mode=WAL is persistent, so it is set once in init_db().
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA cache_spill=FALSE",
+)
+
+# Prepared statements kept per connection; pooled connections live long enough to benefit
+STATEMENT_CACHE_SIZE = 256
+
+def _connect(**kwargs) -> sqlite3.Connection:
+    """Opens a new connection to the SQLite database with the standard pragmas applied."""
+    conn = sqlite3.connect(DB_FILE, cached_statements=STATEMENT_CACHE_SIZE, **kwargs)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """
+    Keeps N read-only connections plus a single writer connection open for reuse.
+    Readers are handed out LIFO so the connection with the warmest page cache is reused first.
+    The writer runs in autocommit mode and is serialized behind a lock.
+    """
+
+    def __init__(self, size: int = DB_READER_POOL_SIZE):
+        self._readers: queue.LifoQueue = queue.LifoQueue()
+        for _ in range(size):
+            conn = _connect(check_same_thread=False)
+            conn.execute("PRAGMA query_only=1")
+            conn.row_factory = sqlite3.Row
+            self._readers.put(conn)
+
+        self._writer = _connect(check_same_thread=False, isolation_level=None)
+        self._writer_lock = threading.Lock()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        with self._writer_lock:
+            yield self._writer
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+def get_reader():
+    """Context manager yielding a pooled read-only connection."""
+    return _get_pool().reader()
+
+def get_writer():
+    """Context manager yielding the shared writer connection, held exclusively."""
+    return _get_pool().writer()
+
+# Columns shown in the dashboard list; all are served from the idx_entries_list covering index.
+# The ordering columns come first, matching the index key order.
+LIST_COLUMNS = ("updated_at", "id", "theme", "source_type", "process_stage", "entry_date")
+
+ENTRY_COLUMNS = (
+    "id, theme, source_type, source_url, entry_date, process_stage, tags, "
+    "summary_caption, explain_like_im_5, file_storage_path, created_at, updated_at"
+)
+
+def _detach_legacy_entries(c: sqlite3.Cursor) -> Optional[str]:
+    """
+    Moves an 'entries' table with an outdated schema aside so init_db can recreate and refill it:
+    older databases keyed the FTS index on the TEXT 'id' column (FTS5 needs an integer rowid),
+    and lack the CHECK(json_valid(tags)) constraint, which ALTER TABLE cannot add.
+    The FTS index and triggers are dropped as well and rebuilt by init_db.
+    Returns the columns to copy back, or None when the schema is current.
+    """
+    row = c.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'entries'").fetchone()
+    if row is None or 'json_valid(tags)' in row[0]:
+        return None
+
+    columns = [row[1] for row in c.execute("PRAGMA table_info(entries)")]
+    c.execute("DROP TRIGGER IF EXISTS entries_ai")
+    c.execute("DROP TRIGGER IF EXISTS entries_au")
+    c.execute("DROP TRIGGER IF EXISTS entries_ad")
+    for fts_table in FTS_TABLES:
+        c.execute(f"DROP TABLE IF EXISTS {fts_table}")
+    c.execute("ALTER TABLE entries RENAME TO entries_legacy")
+    return f"doc_id, {ENTRY_COLUMNS}" if 'doc_id' in columns else ENTRY_COLUMNS
+
+def _table_exists(c: sqlite3.Cursor, name: str) -> bool:
+    return c.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+def _drop_stale_fts(c: sqlite3.Cursor, fts_table: str, tokenize: str) -> bool:
+    """
+    Drops an FTS index if it was created with a different tokenizer, so init_db recreates it.
+    Returns True when the index was dropped and needs a rebuild.
+    """
+    row = c.execute("SELECT sql FROM sqlite_master WHERE name = ?", (fts_table,)).fetchone()
+    if row is None or f"tokenize='{tokenize}'" in row[0]:
+        return False
+
+    c.execute(f"DROP TABLE {fts_table}")
+    return True
 
 def init_db():
-    """Initializes the main entries table and the FTS5 virtual table."""
-    conn = get_db_connection()
+    """Initializes the main entries table, the FTS5 virtual table and the connection pool."""
+    conn = _connect()
     c = conn.cursor()
+
+    # WAL lets readers proceed while the worker writes; the mode persists in the DB file.
+    c.execute("PRAGMA journal_mode=WAL")
+
+    # Run the schema setup (including any migration) as one transaction
+    c.execute("BEGIN")
+
+    legacy_columns = _detach_legacy_entries(c)
+    migrated = legacy_columns is not None
     
     # 1. Main Entries Table (Transactional data and current metadata)
+    # 'doc_id' is an explicit INTEGER PRIMARY KEY (rowid alias) so the FTS index has a
+    # stable integer key that survives VACUUM; 'id' remains the public UUID.
     c.execute('''
         CREATE TABLE IF NOT EXISTS entries (
-            id TEXT PRIMARY KEY,
+            doc_id INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
             theme TEXT,
             source_type TEXT,
             source_url TEXT,
             entry_date TEXT,
             process_stage TEXT,
-            tags TEXT,
+            tags TEXT CHECK (tags IS NULL OR json_valid(tags)),
             summary_caption TEXT,
             explain_like_im_5 TEXT,
             file_storage_path TEXT,
@@ -33,171 +178,460 @@ def init_db():
             updated_at TIMESTAMP
         )
     ''')
-    
-    # 2. FTS5 Virtual Table (Search index for summaries)
-    # The 'content' column is optional but links the index to the main table.
-    # We index 'summary_caption' and link by 'id'.
-    c.execute('''
-        CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
-            id UNINDEXED, 
-            summary_caption, 
-            content='entries', 
-            content_rowid='id'
-        );
+
+    if migrated:
+        c.execute(f'''
+            INSERT INTO entries ({legacy_columns})
+            SELECT {legacy_columns} FROM entries_legacy ORDER BY created_at
+        ''')
+        c.execute("DROP TABLE entries_legacy")
+
+    # 2. FTS5 Virtual Tables (Search indexes for summaries)
+    # External-content tables: only the index is stored, rows are read back from 'entries'
+    # through the integer 'doc_id' key. entries_fts serves word/prefix search,
+    # entries_fts_tri serves infix (substring) search.
+    rebuild_fts = []
+    for fts_table, tokenize in FTS_TABLES.items():
+        if _drop_stale_fts(c, fts_table, tokenize) or migrated or not _table_exists(c, fts_table):
+            rebuild_fts.append(fts_table)
+        c.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                summary_caption, 
+                content='entries', 
+                content_rowid='doc_id',
+                tokenize='{tokenize}'
+            );
+        ''')
+
+    # 3. Triggers to keep the FTS tables synchronized with 'entries'
+    # Triggers ensure FTS5 indexes update whenever an entry is added, changed or removed.
+    # External-content tables can't look up the old text themselves, so every change first
+    # issues a 'delete' with the old values; otherwise stale tokens stay in the index.
+    # They are recreated on every start so they always cover the current set of FTS tables.
+    # The UPDATE trigger only fires when the summary text changes, so stage-only updates
+    # leave the indexes untouched.
+    fts_insert = ''.join(
+        f"INSERT INTO {t}(rowid, summary_caption) VALUES (new.doc_id, new.summary_caption);"
+        for t in FTS_TABLES
+    )
+    fts_delete = ''.join(
+        f"INSERT INTO {t}({t}, rowid, summary_caption) VALUES ('delete', old.doc_id, old.summary_caption);"
+        for t in FTS_TABLES
+    )
+    changed_summary = "WHEN old.summary_caption IS NOT new.summary_caption"
+    for trigger, event, when, body in (
+        ("entries_ai", "INSERT", "", fts_insert),
+        ("entries_au", "UPDATE OF summary_caption", changed_summary, fts_delete + fts_insert),
+        ("entries_ad", "DELETE", "", fts_delete),
+    ):
+        c.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        c.execute(f"CREATE TRIGGER {trigger} AFTER {event} ON entries {when} BEGIN {body} END;")
+
+    for fts_table in rebuild_fts:
+        c.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+
+    # 4. Covering index for the dashboard list: its (updated_at, id) prefix backs keyset
+    # pagination and the trailing columns answer the list projection without touching the
+    # wide rows. It supersedes the earlier (updated_at, id)-only index.
+    c.execute("DROP INDEX IF EXISTS idx_entries_updated_id")
+    c.execute(f'''
+        CREATE INDEX IF NOT EXISTS idx_entries_list ON entries(
+            updated_at DESC, id DESC, {', '.join(LIST_COLUMNS[2:])}
+        )
     ''')
 
-    # 3. Triggers to keep FTS table synchronized with 'entries'
-    # Triggers ensure FTS5 index updates whenever an entry is added or changed.
+    # 5. Persistent processing job queue, claimed atomically by workers (see claim_job)
     c.execute('''
-        CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
-            INSERT INTO entries_fts(id, summary_caption) VALUES (new.id, new.summary_caption);
-        END;
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY,
+            entry_id TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'queued',
+            claimed_at TIMESTAMP,
+            claimed_by TEXT
+        )
     ''')
-    
+    # Older job tables predate worker leases
+    if 'claimed_by' not in [row[1] for row in c.execute("PRAGMA table_info(jobs)")]:
+        c.execute("ALTER TABLE jobs ADD COLUMN claimed_by TEXT")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs(state, id)")
+    # At most one pending job per entry, so re-submitting an entry doesn't process it twice
     c.execute('''
-        CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE ON entries BEGIN
-            UPDATE entries_fts SET summary_caption = new.summary_caption WHERE id = new.id;
-        END;
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active_entry ON jobs(entry_id)
+        WHERE state IN ('queued', 'running')
     ''')
 
-    # Note: DELETE trigger is omitted for brevity but recommended in production.
-    
     conn.commit()
     conn.close()
 
+    _get_pool()
+    invalidate_total_count()
+
+def optimize_db():
+    """
+    Merges the segments of each FTS5 index into one and compacts the database file.
+    Intended to run in the background at startup (or on a nightly schedule); it holds the
+    writer for its whole duration. Row IDs are stable across VACUUM because 'doc_id' is
+    an INTEGER PRIMARY KEY, so the external-content index stays valid.
+    """
+    with get_writer() as conn:
+        for fts_table in FTS_TABLES:
+            conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('optimize')")
+        conn.execute("VACUUM")
+
+# --- Cached total count for the unfiltered dashboard ---
+
+# Number of rows in 'entries', kept in-process so paging through the unfiltered dashboard
+# doesn't rescan the table. None means unknown; it is recomputed on the next read.
+# The generation is bumped on every change so a recount that raced a write is discarded.
+_total_count_cache: Optional[int] = None
+_count_generation = 0
+_count_lock = threading.Lock()
+
+def invalidate_total_count():
+    """Forces the next unfiltered count to be read from the database (e.g. after schema changes)."""
+    global _total_count_cache, _count_generation
+    with _count_lock:
+        _total_count_cache = None
+        _count_generation += 1
+
+def get_total_count() -> int:
+    """Returns the number of entries, from the cache when available."""
+    global _total_count_cache
+    with _count_lock:
+        if _total_count_cache is not None:
+            return _total_count_cache
+        generation = _count_generation
+
+    # Recount without holding the lock so writers never wait on it
+    with get_reader() as conn:
+        total = conn.execute("SELECT COUNT(id) FROM entries").fetchone()[0]
+
+    with _count_lock:
+        if _count_generation == generation:
+            _total_count_cache = total
+    return total
+
 # --- Core CRUD Functions (Updated to handle FTS synchronization via triggers) ---
 
-def add_entry(entry_data: dict) -> str:
-    """Inserts a new entry into the main table and triggers FTS indexing."""
-    conn = get_db_connection()
-    c = conn.cursor()
-    
-    new_id = str(uuid.uuid4())
+def add_entries(entry_list: List[dict]) -> List[str]:
+    """
+    Inserts several new entries in a single transaction (one commit for the whole batch)
+    and triggers FTS indexing. Returns the new IDs in input order.
+    """
+    global _total_count_cache, _count_generation
     now = datetime.now()
+    new_ids = []
+    rows = []
+    for entry_data in entry_list:
+        # Dashless hex UUIDs keep the id column and its index keys 4 bytes shorter
+        new_id = uuid.uuid4().hex
+        new_ids.append(new_id)
+        rows.append((
+            new_id,
+            entry_data.get('theme', 'General'),
+            entry_data['source_type'],
+            entry_data['source_url'],
+            entry_data.get('entry_date', str(now.strftime("%Y-%m"))),
+            'Uploaded',
+            now,
+            now,
+            'Processing summary...' # Placeholder summary, updated by worker later
+        ))
     
-    c.execute('''
-        INSERT INTO entries (
-            id, theme, source_type, source_url, entry_date, 
-            process_stage, created_at, updated_at, summary_caption
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        new_id,
-        entry_data.get('theme', 'General'),
-        entry_data['source_type'],
-        entry_data['source_url'],
-        entry_data.get('entry_date', str(now.strftime("%Y-%m"))),
-        'Uploaded',
-        now,
-        now,
-        'Processing summary...' # Placeholder summary, updated by worker later
-    ))
-    conn.commit()
-    conn.close()
-    return new_id
+    with get_writer() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany('''
+                INSERT INTO entries (
+                    id, theme, source_type, source_url, entry_date, 
+                    process_stage, created_at, updated_at, summary_caption
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # Only take the count lock once committed; bumping the generation stops an in-flight
+    # recount (which may already include these rows) from caching a stale total.
+    with _count_lock:
+        _count_generation += 1
+        if _total_count_cache is not None:
+            _total_count_cache += len(rows)
+    return new_ids
+
+def add_entry(entry_data: dict) -> str:
+    """Inserts a new entry into the main table and triggers FTS indexing."""
+    return add_entries([entry_data])[0]
+
+UPDATE_STATUS_QUERY = '''
+    UPDATE entries SET
+        process_stage = ?,
+        updated_at = ?,
+        summary_caption = COALESCE(?, summary_caption),
+        explain_like_im_5 = COALESCE(?, explain_like_im_5),
+        tags = COALESCE(?, tags),
+        file_storage_path = COALESCE(?, file_storage_path)
+    WHERE id = ?
+'''
+
+def _status_params(entry_id: str, stage: str, result_data: Optional[dict] = None) -> tuple:
+    """Binds update_status arguments to UPDATE_STATUS_QUERY; absent fields are NULL and keep their value."""
+    result_data = result_data or {}
+    tags = result_data.get('tags')
+    return (
+        stage,
+        datetime.now(),
+        result_data.get('summary_caption'),
+        result_data.get('explain_like_im_5'),
+        orjson.dumps(tags).decode() if tags is not None else None,
+        result_data.get('file_storage_path'),
+        entry_id
+    )
 
 def update_status(entry_id: str, stage: str, result_data: Optional[dict] = None):
     """Update stage and optionally save LLM results, triggering FTS update."""
-    conn = get_db_connection()
-    c = conn.cursor()
-    
-    now = datetime.now()
-    query = "UPDATE entries SET process_stage = ?, updated_at = ?"
-    params: List[any] = [stage, now]
-
-    if result_data:
-        if 'summary_caption' in result_data:
-            query += ", summary_caption = ?"
-            params.append(result_data['summary_caption'])
-        if 'explain_like_im_5' in result_data:
-            query += ", explain_like_im_5 = ?"
-            params.append(result_data['explain_like_im_5'])
-        if 'tags' in result_data:
-            query += ", tags = ?"
-            params.append(json.dumps(result_data['tags']))
-        if 'file_storage_path' in result_data:
-            query += ", file_storage_path = ?"
-            params.append(result_data['file_storage_path'])
-
-    query += " WHERE id = ?"
-    params.append(entry_id)
-    
-    c.execute(query, tuple(params))
-    conn.commit()
-    conn.close()
+    # Fixed statement text so sqlite3's per-connection statement cache is always hit
+    with get_writer() as conn:
+        conn.execute(UPDATE_STATUS_QUERY, _status_params(entry_id, stage, result_data))
+
+def update_statuses(updates: List[Tuple[str, str, Optional[dict]]]):
+    """
+    Applies several (entry_id, stage, result_data) status updates in one transaction,
+    so a batch costs a single commit instead of one per update.
+    """
+    with get_writer() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(UPDATE_STATUS_QUERY, [_status_params(*update) for update in updates])
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+# --- Processing Job Queue ---
+
+# A claimed job belongs to its worker for this long; workers renew the lease while they run
+# (see renew_job_leases), so only jobs of a dead or stalled worker outlive it.
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", 60))
+
+def enqueue_jobs(entry_ids: List[str]) -> List[str]:
+    """
+    Queues a processing job for each entry in one transaction.
+    Entries that already have a queued or running job are skipped.
+    Returns the IDs that were queued.
+    """
+    queued = []
+    with get_writer() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for entry_id in entry_ids:
+                c = conn.execute("INSERT OR IGNORE INTO jobs (entry_id) VALUES (?)", (entry_id,))
+                if c.rowcount:
+                    queued.append(entry_id)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    return queued
+
+def claim_job(worker_id: str) -> Optional[Tuple[int, str]]:
+    """
+    Atomically marks the oldest queued job as running under worker_id's lease and returns
+    its (job_id, entry_id), or None when the queue is empty. The single UPDATE ... RETURNING
+    is safe to call from several threads or processes at once.
+    """
+    with get_writer() as conn:
+        rows = conn.execute('''
+            UPDATE jobs SET state = 'running', claimed_at = ?, claimed_by = ?
+            WHERE id = (SELECT id FROM jobs WHERE state = 'queued' ORDER BY id LIMIT 1)
+            RETURNING id, entry_id
+        ''', (datetime.now(), worker_id)).fetchall()
+    return (rows[0][0], rows[0][1]) if rows else None
+
+def finish_job(job_id: int, state: str, worker_id: str):
+    """
+    Records the final state ('done' or 'failed') of a claimed job. Ignored if the worker's
+    lease lapsed and the job was recovered meanwhile.
+    """
+    with get_writer() as conn:
+        conn.execute(
+            "UPDATE jobs SET state = ? WHERE id = ? AND state = 'running' AND claimed_by = ?",
+            (state, job_id, worker_id)
+        )
+
+def renew_job_leases(worker_id: str) -> int:
+    """Extends the lease on every job worker_id is running. Returns the number renewed."""
+    with get_writer() as conn:
+        c = conn.execute(
+            "UPDATE jobs SET claimed_at = ? WHERE state = 'running' AND claimed_by = ?",
+            (datetime.now(), worker_id)
+        )
+    return c.rowcount
+
+def _lease_cutoff() -> datetime:
+    return datetime.now() - timedelta(seconds=JOB_LEASE_SECONDS)
+
+def requeue_expired_jobs() -> int:
+    """
+    Puts 'running' jobs whose lease has lapsed back in the queue, recovering work claimed
+    by a worker that died. Safe to call from any process at any time. Returns the number requeued.
+    """
+    with get_writer() as conn:
+        c = conn.execute('''
+            UPDATE jobs SET state = 'queued', claimed_at = NULL, claimed_by = NULL
+            WHERE state = 'running' AND claimed_at < ?
+        ''', (_lease_cutoff(),))
+    return c.rowcount
+
+def requeue_entry(entry_id: str) -> bool:
+    """
+    Resets an entry to 'Uploaded' and queues a fresh job for it, retiring a 'running' job
+    whose lease has lapsed. Returns False, changing nothing, while a job is still queued
+    or held by a live worker. Runs as one transaction, so no worker can claim in between.
+    """
+    with get_writer() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE jobs SET state = 'failed' WHERE entry_id = ? AND state = 'running' AND claimed_at < ?",
+                (entry_id, _lease_cutoff())
+            )
+            queued = conn.execute("INSERT OR IGNORE INTO jobs (entry_id) VALUES (?)", (entry_id,)).rowcount
+            if queued:
+                conn.execute(UPDATE_STATUS_QUERY, _status_params(entry_id, "Uploaded"))
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    return bool(queued)
+
+def _row_to_entry(row: sqlite3.Row) -> dict:
+    """Converts a row to a dict, decoding the JSON 'tags' column so it is not re-encoded as a string."""
+    entry = dict(row)
+    if entry.get('tags'):
+        entry['tags'] = orjson.loads(entry['tags'])
+    return entry
 
 def get_entry(entry_id: str) -> Optional[dict]:
-    # ... (Implementation remains the same)
-    conn = get_db_connection()
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    c.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
-    row = c.fetchone()
-    conn.close()
-    return dict(row) if row else None
+    with get_reader() as conn:
+        row = conn.execute(f"SELECT {ENTRY_COLUMNS} FROM entries WHERE id = ?", (entry_id,)).fetchone()
+    return _row_to_entry(row) if row else None
 
 
 # --- New Search and Pagination Methods ---
 
-def search_entries(keyword: str) -> List[str]:
-    """Uses FTS5 to find entry IDs matching the keyword."""
-    conn = get_db_connection()
-    c = conn.cursor()
-    
-    # FTS5 MATCH query for prefix searching (e.g., 'art*' finds 'artist', 'artistic')
-    # The double quotes ensure the phrase is treated as a token set.
-    query = "SELECT id FROM entries_fts WHERE summary_caption MATCH ?"
-    c.execute(query, (f'{keyword}*',))
-    
-    # Extract IDs from the results
-    matching_ids = [row[0] for row in c.fetchall()]
-    conn.close()
-    return matching_ids
+def build_match_query(keyword: str, infix: bool = False) -> str:
+    """
+    Turns raw user input into an FTS5 query of quoted terms, ANDed together
+    (e.g. 'art hist' -> '"art"* "hist"*'; infix queries omit the prefix '*').
+    Quoting keeps FTS5 operators and stray quotes in the input from breaking the MATCH syntax.
+    Terms shorter than FTS_MIN_KEYWORD_LENGTH are dropped, since a short trigram term matches
+    every row and a short prefix nearly so; raises ValueError if no term remains.
+    """
+    terms = [
+        term for term in re.sub(r'["\s]+', ' ', keyword).split()
+        if len(term) >= FTS_MIN_KEYWORD_LENGTH
+    ]
+    if not terms:
+        raise ValueError(f"Search keyword must contain a term of at least {FTS_MIN_KEYWORD_LENGTH} characters.")
+
+    suffix = '' if infix else '*'
+    return ' '.join(f'"{term}"{suffix}' for term in terms)
+
+
+def encode_cursor(updated_at: str, entry_id: str) -> str:
+    """Packs the (updated_at, id) position of a row into an opaque pagination cursor."""
+    return base64.urlsafe_b64encode(f"{updated_at}|{entry_id}".encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of encode_cursor. Raises ValueError on a malformed cursor."""
+    try:
+        updated_at, entry_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|', 1)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    return updated_at, entry_id
 
 
 def get_paginated_entries(
     page: int, 
     limit: int, 
-    matching_ids: Optional[List[str]] = None
-) -> Tuple[pd.DataFrame, int]:
+    tag: Optional[str] = None,
+    cursor: Optional[str] = None,
+    keyword: Optional[str] = None,
+    include_total: bool = True,
+    infix: bool = False
+) -> Tuple[List[Dict], Optional[int], Optional[str]]:
     """
-    Fetches a single page of data, optionally filtered by IDs, 
-    and returns the total count for pagination.
+    Fetches a single page of the list view (LIST_COLUMNS only; use get_entry for the
+    long-form fields), optionally filtered by tag and/or an FTS keyword, 
+    and returns the total count for pagination plus the cursor of the next page.
+    The total is None when include_total is False; unfiltered totals come from a cache.
+    With infix=True the keyword is matched anywhere inside words via the trigram index.
+    When a cursor is given the page is located by seeking on (updated_at, id),
+    so the cost is constant regardless of depth; otherwise falls back to OFFSET.
     """
-    conn = get_db_connection()
-    offset = (page - 1) * limit
-    
-    # Base query for data retrieval
-    data_query = "SELECT * FROM entries"
-    
-    # Base query for total count (for pagination metadata)
-    count_query = "SELECT COUNT(id) FROM entries"
-    
-    where_clause = ""
+    from_clause = " FROM entries e"
+    conditions: List[str] = []
     params: List[any] = []
-    
-    if matching_ids:
-        # Create a string of placeholders (?, ?, ?) for the IN clause
-        placeholders = ', '.join(['?'] * len(matching_ids))
-        where_clause = f" WHERE id IN ({placeholders})"
-        params.extend(matching_ids)
 
-    # --- Execute Count Query ---
-    final_count_query = count_query + where_clause
-    total_count = conn.execute(final_count_query, params).fetchone()[0]
-    
-    # --- Execute Data Query with Pagination ---
+    if keyword:
+        # Join from the FTS index so the planner drives the query from the MATCH. Every match
+        # is ordered by updated_at (no rank-capped candidate set), so OFFSET and cursor pages
+        # walk one consistent result set and agree with the total.
+        fts_table = "entries_fts_tri" if infix else "entries_fts"
+        from_clause = f" FROM {fts_table} JOIN entries e ON e.doc_id = {fts_table}.rowid"
+        conditions.append(f"{fts_table} MATCH ?")
+        params.append(build_match_query(keyword, infix))
+
+    if tag:
+        # json_each expands the JSON 'tags' array in SQLite, so matching is exact per tag
+        # rather than a substring LIKE over the serialized text
+        conditions.append("EXISTS (SELECT 1 FROM json_each(e.tags) WHERE value = ?)")
+        params.append(tag)
+
+    # Base query for total count (for pagination metadata)
+    where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
+    final_count_query = "SELECT COUNT(e.id)" + from_clause + where_clause
+
+    # Keyset condition only narrows the data query
+    data_conditions = list(conditions)
+    data_params = list(params)
+    offset = (page - 1) * limit
+
+    if cursor:
+        last_updated_at, last_id = decode_cursor(cursor)
+        # Row-value comparison so the planner can seek the (updated_at, id) index prefix
+        data_conditions.append("(e.updated_at, e.id) < (?, ?)")
+        data_params.extend([last_updated_at, last_id])
+        offset = 0
+
     # Apply ordering and LIMIT/OFFSET for the specific page
     final_data_query = (
-        data_query + 
-        where_clause + 
-        " ORDER BY updated_at DESC LIMIT ? OFFSET ?"
+        "SELECT " + ', '.join(f"e.{col}" for col in LIST_COLUMNS) + 
+        from_clause + 
+        (" WHERE " + " AND ".join(data_conditions) if data_conditions else "") + 
+        " ORDER BY e.updated_at DESC, e.id DESC LIMIT ? OFFSET ?"
     )
     
     # Add LIMIT and OFFSET to the parameters for the final execution
-    data_params = params + [limit, offset]
-    
-    df = pd.read_sql_query(final_data_query, conn, params=data_params)
-    
-    conn.close()
+    data_params.extend([limit, offset])
+
+    # --- Execute Count Query ---
+    total_count = None
+    if include_total:
+        if keyword or tag:
+            with get_reader() as conn:
+                total_count = conn.execute(final_count_query, params).fetchone()[0]
+        else:
+            total_count = get_total_count()
+
+    with get_reader() as conn:
+        # --- Execute Data Query with Pagination ---
+        rows = conn.execute(final_data_query, data_params).fetchall()
+
+    next_cursor = None
+    if rows and len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1]['updated_at'], rows[-1]['id'])
     
-    return df, total_count
\ No newline at end of file
+    return [_row_to_entry(row) for row in rows], total_count, next_cursor
\ No newline at end of file
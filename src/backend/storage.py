@@ -1,7 +1,10 @@
 import boto3
 import os
+import threading
 from io import BytesIO
-from botocore.exceptions import NoCredentialsError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError, NoCredentialsError
 
 # Load from .env or environment variables
 ENDPOINT_URL = os.getenv("AWS_ENDPOINT_URL")
@@ -9,29 +12,66 @@ ACCESS_KEY = os.getenv("AWS_ACCESS_KEY_ID")
 SECRET_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 BUCKET_NAME = os.getenv("AWS_BUCKET_NAME", "knowledge-repo")
 
+# Files above the threshold are sent as concurrent multipart chunks, read straight from the stream
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    max_concurrency=4,
+    use_threads=True
+)
+
+# Building a client is expensive (credential resolution, signer, TLS pool), so one is shared.
+# boto3 clients are thread-safe once constructed.
+_s3 = None
+_s3_lock = threading.Lock()
+_bucket_verified = False
+
 def get_s3_client():
-    return boto3.client(
-        's3',
-        endpoint_url=ENDPOINT_URL,
-        aws_access_key_id=ACCESS_KEY,
-        aws_secret_access_key=SECRET_KEY
-    )
+    global _s3
+    if _s3 is None:
+        with _s3_lock:
+            if _s3 is None:
+                session = boto3.session.Session()
+                _s3 = session.client(
+                    's3',
+                    endpoint_url=ENDPOINT_URL,
+                    aws_access_key_id=ACCESS_KEY,
+                    aws_secret_access_key=SECRET_KEY,
+                    config=Config(max_pool_connections=20)
+                )
+    return _s3
+
+def ensure_bucket(s3):
+    """Creates the bucket if it does not exist; only checked once per process."""
+    global _bucket_verified
+    if _bucket_verified:
+        return
+    # Serialized so concurrent first uploads don't all race to create the bucket
+    with _s3_lock:
+        if _bucket_verified:
+            return
+        try:
+            s3.head_bucket(Bucket=BUCKET_NAME)
+        except ClientError:
+            try:
+                s3.create_bucket(Bucket=BUCKET_NAME)
+            except ClientError as e:
+                # Another process created it in the meantime
+                if e.response.get('Error', {}).get('Code') not in ("BucketAlreadyOwnedByYou", "BucketAlreadyExists"):
+                    raise
+        _bucket_verified = True
 
 def upload_file(file_obj, object_name, content_type=None):
     s3 = get_s3_client()
     try:
         # Create bucket if not exists
-        try:
-            s3.head_bucket(Bucket=BUCKET_NAME)
-        except:
-            s3.create_bucket(Bucket=BUCKET_NAME)
+        ensure_bucket(s3)
 
         extra_args = {}
         if content_type:
             extra_args['ContentType'] = content_type
 
         file_obj.seek(0)
-        s3.upload_fileobj(file_obj, BUCKET_NAME, object_name, ExtraArgs=extra_args)
+        s3.upload_fileobj(file_obj, BUCKET_NAME, object_name, ExtraArgs=extra_args, Config=TRANSFER_CONFIG)
         return f"{BUCKET_NAME}/{object_name}"
     except Exception as e:
         print(f"Upload Error: {e}")
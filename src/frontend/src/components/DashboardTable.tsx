@@ -1,8 +1,8 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { Table, Tag, Button, Space, message, Select, Input, TableProps } from 'antd';
 import { ColumnsType } from 'antd/es/table';
 import axios from 'axios';
-import { Entry, ApiResponse, TablePagination } from '../types';
+import { Entry, EntryDetail, ApiResponse, TablePagination } from '../types';
 
 const API_BASE_URL = '/api/entries'; // Replace with your actual backend URL
 
@@ -31,6 +31,11 @@ const DashboardTable: React.FC = () => {
     total: 0,
   });
   const [searchText, setSearchText] = useState<string>('');
+  // Keyset cursors keyed by page number, filled from each response's next_cursor.
+  // Pages without a known cursor (direct jumps) fall back to the page number.
+  const cursors = useRef<Record<number, string>>({});
+  // Long-form fields are not part of the list payload; they are loaded when a row is expanded.
+  const [details, setDetails] = useState<Record<string, EntryDetail>>({});
 
   // --- 3. Data Fetching Logic ---
   const fetchData = useCallback(async (current: number, pageSize: number, keyword: string) => {
@@ -41,13 +46,19 @@ const DashboardTable: React.FC = () => {
           page: current,
           limit: pageSize,
           keyword: keyword,
+          cursor: cursors.current[current],
+          include_total: true,
         },
       });
 
+      if (response.data.next_cursor) {
+        cursors.current[current + 1] = response.data.next_cursor;
+      }
+
       setData(response.data.data);
       setPagination(prev => ({
         ...prev,
-        total: response.data.total,
+        total: response.data.total ?? prev.total,
         current: current,
         pageSize: pageSize,
       }));
@@ -72,17 +83,49 @@ const DashboardTable: React.FC = () => {
     // so we provide fallbacks to ensure type safety.
     const newCurrent = current ?? pagination.current;
     const newPageSize = pageSize ?? pagination.pageSize;
+    if (newPageSize !== pagination.pageSize) {
+      cursors.current = {};
+    }
 
     setPagination(prev => ({...prev, current: newCurrent, pageSize: newPageSize}));
     // Explicitly call fetchData here to trigger the API call immediately
     fetchData(newCurrent, newPageSize, searchText);
   };
 
+  const fetchDetail = async (id: string) => {
+    try {
+      const response = await axios.get<EntryDetail>(`${API_BASE_URL}/${id}`);
+      setDetails(prev => ({ ...prev, [id]: response.data }));
+    } catch (error) {
+      message.error('Failed to fetch entry details.');
+    }
+  };
+
+  const renderDetail = (record: Entry): React.ReactNode => {
+    const detail = details[record.id];
+    if (!detail) {
+      return 'Loading...';
+    }
+    return (
+      <>
+        <p><strong>Summary:</strong> {detail.summary_caption}</p>
+        {detail.explain_like_im_5 && <p><strong>ELI5:</strong> {detail.explain_like_im_5}</p>}
+        {detail.tags?.map(tag => <Tag key={tag}>{tag}</Tag>)}
+      </>
+    );
+  };
+
   // --- 4. Action Handlers ---
   const handleReprocess = async (id: string) => {
     try {
       await axios.post(`/api/reprocess/${id}`);
       message.success('Reprocessing job started.');
+      setDetails(prev => {
+        const next = { ...prev };
+        delete next[id];
+        return next;
+      });
+      cursors.current = {}; // Reprocessing bumps updated_at, so stored cursors are stale
       fetchData(pagination.current, pagination.pageSize, searchText); // Refresh data
     } catch (error) {
       message.error('Reprocessing failed.');
@@ -109,7 +152,6 @@ const DashboardTable: React.FC = () => {
           onChange={(value) => handleEdit(record.id, 'theme', value)}
         />
     )},
-    { title: 'Caption/Summary', dataIndex: 'summary_caption', key: 'summary_caption', ellipsis: true },
     { 
       title: 'Stage', 
       dataIndex: 'process_stage', 
@@ -140,7 +182,13 @@ const DashboardTable: React.FC = () => {
         placeholder="Search summary by keyword"
         allowClear
         onSearch={(value) => {
+          // The backend ignores terms shorter than 3 characters and rejects a keyword with none longer
+          if (value && !value.split(/\s+/).some(term => term.replace(/"/g, '').length >= 3)) {
+            message.warning('Enter a word of at least 3 characters to search.');
+            return;
+          }
           setSearchText(value);
+          cursors.current = {};
           // When searching, reset to page 1 to start fresh results
           setPagination(prev => ({...prev, current: 1}));
           fetchData(1, pagination.pageSize, value);
@@ -154,6 +202,14 @@ const DashboardTable: React.FC = () => {
         loading={loading}
         pagination={{...pagination, showSizeChanger: true}}
         onChange={handleTableChange}
+        expandable={{
+          expandedRowRender: renderDetail,
+          onExpand: (expanded, record) => {
+            if (expanded && !details[record.id]) {
+              fetchDetail(record.id);
+            }
+          },
+        }}
         scroll={{ x: 'max-content' }}
       />
     </>
@@ -2,16 +2,23 @@ export interface Entry {
   id: string;
   theme: string;
   source_type: 'image' | 'link';
-  source_url: string;
   entry_date: string;
   process_stage: 'Uploaded' | 'Preprocessing' | 'Summarizing' | 'Complete' | 'Error';
-  summary_caption: string;
   updated_at: string;
 }
 
+// Full record from /api/entries/{id}; the list endpoint only returns the Entry fields.
+export interface EntryDetail extends Entry {
+  source_url: string;
+  summary_caption: string;
+  explain_like_im_5: string | null;
+  tags: string[] | null;
+}
+
 export interface ApiResponse {
   data: Entry[];
-  total: number;
+  total: number | null;
+  next_cursor: string | null;
 }
 
 export interface TablePagination {